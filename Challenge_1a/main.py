@@ -1,26 +1,85 @@
 # main.py
 import os
 import json
+import math
+from concurrent.futures import ProcessPoolExecutor
 from parser import extract_outline
 
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib encoder when orjson is unavailable
+    orjson = None
+
 INPUT_DIR = "/app/input"
 OUTPUT_DIR = "/app/output"
 
-if _name_ == "_main_":
+def cgroup_cpu_limit():
+    # CPU quota set by the container runtime (docker --cpus), if any
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:  # cgroup v2
+            quota, period = f.read().split()
+        if quota != "max":
+            return max(1, math.ceil(int(quota) / int(period)))
+    except (OSError, ValueError):
+        pass
+    try:
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as f:  # cgroup v1
+            quota = int(f.read())
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as f:
+            period = int(f.read())
+        if quota > 0:
+            return max(1, math.ceil(quota / period))
+    except (OSError, ValueError):
+        pass
+    return None
+
+def effective_cpus():
+    # os.cpu_count() reports host CPUs; inside a container only the affinity
+    # mask and the cgroup quota say how many cores we can actually use
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # Not available on macOS/Windows
+        cpus = os.cpu_count() or 1
+    limit = cgroup_cpu_limit()
+    return min(cpus, limit) if limit else cpus
+
+# Worker processes for parsing; override with the PDF_WORKERS env var
+WORKERS = int(os.environ.get("PDF_WORKERS", 0)) or min(effective_cpus(), 4)
+
+def write_json(path, data):
+    if orjson is not None:
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
+def parse_all(pdf_paths):
+    # A lone PDF cannot use the file-level pool, so give its pages the workers
+    if len(pdf_paths) == 1:
+        yield extract_outline(pdf_paths[0], page_workers=WORKERS)
+        return
+    # PDFs are independent, so parse them in parallel worker processes
+    with ProcessPoolExecutor(max_workers=WORKERS) as ex:
+        yield from ex.map(extract_outline, pdf_paths, chunksize=1)
+
+if __name__ == "__main__":
     os.makedirs(OUTPUT_DIR, exist_ok=True)
 
     print(f"Starting processing of PDFs from {INPUT_DIR}...")
 
-    for filename in os.listdir(INPUT_DIR):
-        if filename.lower().endswith(".pdf"):
-            pdf_path = os.path.join(INPUT_DIR, filename)
-            print(f"Processing: {pdf_path}")
-            result = extract_outline(pdf_path)
-
-            json_path = os.path.join(OUTPUT_DIR, filename.replace(".pdf", ".json"))
-            with open(json_path, "w") as f:
-                json.dump(result, f, indent=4)
-            
-            print(f"Saved output to {json_path}")
+    # scandir gives file-type info without extra stat calls; sorted so
+    # submission and output order are deterministic across runs
+    with os.scandir(INPUT_DIR) as it:
+        filenames = sorted(e.name for e in it if e.is_file() and e.name.lower().endswith(".pdf"))
+    pdf_paths = [os.path.join(INPUT_DIR, filename) for filename in filenames]
+
+    for filename, result in zip(filenames, parse_all(pdf_paths)):
+        print(f"Processed: {os.path.join(INPUT_DIR, filename)}")
+
+        json_path = os.path.join(OUTPUT_DIR, filename.replace(".pdf", ".json"))
+        write_json(json_path, result)
+        
+        print(f"Saved output to {json_path}")
 
     print("Processing complete.")
\ No newline at end of file
@@ -2,16 +2,58 @@
 
 import os
 import json
+import hashlib
+import math
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from parser import extract_outline
 from ranker import rank_sections
 from summarizer import extract_subsections
 
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib encoder when orjson is unavailable
+    orjson = None
+
 COLLECTION_PATH = "Collection 1"
   # <- Change to Collection 2 / 3 to test others
 PDF_DIR = os.path.join(COLLECTION_PATH, "PDFs")
 INPUT_JSON = os.path.join(COLLECTION_PATH, "challenge1b_input.json")
 OUTPUT_JSON = os.path.join(COLLECTION_PATH, "generated_output.json")
+CACHE_DIR = ".cache"
+
+def cgroup_cpu_limit():
+    # CPU quota set by the container runtime (docker --cpus), if any
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:  # cgroup v2
+            quota, period = f.read().split()
+        if quota != "max":
+            return max(1, math.ceil(int(quota) / int(period)))
+    except (OSError, ValueError):
+        pass
+    try:
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as f:  # cgroup v1
+            quota = int(f.read())
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as f:
+            period = int(f.read())
+        if quota > 0:
+            return max(1, math.ceil(quota / period))
+    except (OSError, ValueError):
+        pass
+    return None
+
+def effective_cpus():
+    # os.cpu_count() reports host CPUs; inside a container only the affinity
+    # mask and the cgroup quota say how many cores we can actually use
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # Not available on macOS/Windows
+        cpus = os.cpu_count() or 1
+    limit = cgroup_cpu_limit()
+    return min(cpus, limit) if limit else cpus
+
+# Worker processes for parsing; override with the PDF_WORKERS env var
+WORKERS = int(os.environ.get("PDF_WORKERS", 0)) or min(effective_cpus(), 4)
 
 def load_input():
     with open(INPUT_JSON) as f:
@@ -22,12 +64,50 @@ def load_input():
     filenames = [d["filename"] for d in documents]
     return persona, job, filenames
 
+def write_json(path, data):
+    # Write to a temp file and rename it over the target, so an interrupted
+    # run never leaves a truncated output or cache entry behind
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    if orjson is not None:
+        with open(tmp_path, "wb") as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False, default=datetime.isoformat)
+    os.replace(tmp_path, path)
+
+def outline_cache_path(pdf_path):
+    # Keyed by path, mtime and size so an edited or replaced PDF is re-parsed
+    try:
+        st = os.stat(pdf_path)
+    except OSError:
+        return None
+    key = f"{os.path.abspath(pdf_path)}:{st.st_mtime_ns}:{st.st_size}"
+    return os.path.join(CACHE_DIR, hashlib.sha1(key.encode()).hexdigest() + ".json")
+
 def parse_pdfs(filenames):
     outlines = {}
+    cache_paths = {}
     for filename in filenames:
-        path = os.path.join(PDF_DIR, filename)
-        outlines[filename] = extract_outline(path)
-    return outlines
+        cache_path = outline_cache_path(os.path.join(PDF_DIR, filename))
+        if cache_path and os.path.exists(cache_path):
+            with open(cache_path) as f:
+                outlines[filename] = json.load(f)
+        else:
+            cache_paths[filename] = cache_path
+
+    # Each PDF is parsed independently, so spread them across worker processes
+    missing = list(cache_paths)
+    if missing:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        paths = [os.path.join(PDF_DIR, filename) for filename in missing]
+        with ProcessPoolExecutor(max_workers=WORKERS) as ex:
+            for filename, outline in zip(missing, ex.map(extract_outline, paths)):
+                outlines[filename] = outline
+                if cache_paths[filename]:
+                    write_json(cache_paths[filename], outline)
+
+    return {filename: outlines[filename] for filename in filenames}
 
 def generate_output(persona, job, input_docs, top_sections, subsections):
     return {
@@ -35,7 +115,7 @@ def generate_output(persona, job, input_docs, top_sections, subsections):
             "input_documents": input_docs,
             "persona": persona,
             "job_to_be_done": job,
-            "processing_timestamp": datetime.utcnow().isoformat()
+            "processing_timestamp": datetime.utcnow()  # Serialized as ISO 8601
         },
         "extracted_sections": top_sections,
         "subsection_analysis": subsections
@@ -52,7 +132,6 @@ if __name__ == "__main__":
 
     result = generate_output(persona, job, input_files, top_sections, subsections)
 
-    with open(OUTPUT_JSON, "w") as f:
-        json.dump(result, f, indent=2)
+    write_json(OUTPUT_JSON, result)
 
     print(f" Output written to {OUTPUT_JSON}")
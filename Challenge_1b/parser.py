@@ -1,105 +1,194 @@
 import fitz  
 import collections
 import re
+import string
 import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from operator import attrgetter
+
+# Compiled once at import. Rejects common non-headings ("Page", "Figure",
+# "Table") and text ending in . : ;
+_REJECT_RE = re.compile(r"^(?:page|figure|table)$|[.:;]$", re.IGNORECASE)
+_ASCII_LOWER = string.ascii_lowercase.encode()
+# Text-only extraction: skip embedding image blocks in the page dict
+_TEXT_FLAGS = fitz.TEXTFLAGS_DICT & ~fitz.TEXT_PRESERVE_IMAGES
+# Below this many pages a PDF is always parsed serially
+PARALLEL_MIN_PAGES = 30
+
+# Outline levels assigned to heading styles, largest first
+_LEVELS = ("H1", "H2", "H3", "H4", "H5")
+
+
+class Span:
+    # Slotted record for spans kept past the walk: no per-instance __dict__
+    __slots__ = ("text", "size", "font", "bold", "page", "y")
+
+    def __init__(self, text, size, font, bold, page, y):
+        self.text = text
+        self.size = size
+        self.font = font
+        self.bold = bold
+        self.page = page
+        self.y = y
 
 
 def normalize(text):
-    text = unicodedata.normalize("NFKC", text)  # Normalize multilingual characters
-    return re.sub(r"\s+", " ", text.strip())
+    # ASCII is already NFKC-normal, so only run the Unicode tables when needed
+    if not text.isascii():
+        text = unicodedata.normalize("NFKC", text)  # Normalize multilingual characters
+    # split() drops leading/trailing whitespace and collapses runs in one C pass
+    return " ".join(text.split())
+
+
+def count_lowercase(text):
+    if text.isascii():
+        # Deleting a-z via bytes.translate counts lowercase letters in C
+        return len(text) - len(text.encode("ascii").translate(None, _ASCII_LOWER))
+    return sum(c.islower() for c in text)
 
 
 def is_heading_candidate(text, size, font, bold, y_position):
-    if not text or len(text) > 120 or len(text.split()) > 20:
-        return False
-    if len(text) < 3:
+    # Cheapest checks first; text is normalized, so words are single-space separated
+    n = len(text)
+    if n < 3 or n > 120 or text.count(" ") >= 20:
         return False
-    if any(text.endswith(c) for c in [".", ":", ";"]):
-        return False
-    if text.lower() in {"page", "figure", "table"}:
+    if y_position > 700:  # Avoid footer/footer-like lines
         return False
-    if not bold and sum(c.islower() for c in text) > len(text) * 0.7:
+    if _REJECT_RE.search(text):
         return False
-    if y_position > 700:  # Avoid footer/footer-like lines
+    if not bold and count_lowercase(text) > n * 0.7:
         return False
     return True
 
 
-def group_styles(text_blocks):
-    style_counter = collections.Counter((b["size"], b["bold"]) for b in text_blocks)
+def group_styles(style_counter):
     common_style = style_counter.most_common(1)[0][0]
     heading_styles = [
         style for style in style_counter
         if style[0] > common_style[0] or (style[1] and style[0] >= common_style[0])
     ]
     heading_styles = sorted(heading_styles, key=lambda x: (-x[0], not x[1]))[:5]
-    return {style: f"H{i+1}" for i, style in enumerate(heading_styles)}
+    return dict(zip(heading_styles, _LEVELS))
 
 
 def extract_title(first_page_blocks):
+    # Equivalent to key=(-size, y): two stable sorts with C-level attrgetter keys
     large_blocks = sorted(
-        [b for b in first_page_blocks if len(b["text"]) > 5],
-        key=lambda b: (-b["size"], b["y"])
+        [b for b in first_page_blocks if len(b.text) > 5],
+        key=attrgetter("y")
     )
+    large_blocks.sort(key=attrgetter("size"), reverse=True)
     top_texts = []
     for b in large_blocks:
-        if not any(b["text"] in t["text"] for t in top_texts):
+        if not any(b.text in t.text for t in top_texts):
             top_texts.append(b)
         if len(top_texts) == 2:
             break
-    return normalize(" ".join(b["text"] for b in top_texts))
+    return normalize(" ".join(b.text for b in top_texts))
+
+
+def scan_pages(doc, start, end):
+    # Single walk over the spans of pages [start, end): count styles, keep
+    # first-page spans for the title and keep only spans that can still
+    # become headings
+    style_counter = collections.Counter()
+    first_page_blocks = []
+    # Heading candidates are kept as parallel lists rather than one dict each
+    cand_texts, cand_styles, cand_pages = [], [], []
+    for page_num in range(start, end):
+        page = doc.load_page(page_num)
+        blocks = page.get_text("dict", flags=_TEXT_FLAGS)["blocks"]
+        styles = []
+        for b in blocks:
+            if b.get("type", 0) != 0:
+                continue
+            for l in b["lines"]:
+                for s in l["spans"]:
+                    raw = s["text"]
+                    if not raw or raw.isspace():
+                        continue
+                    text = normalize(raw)
+                    if not text:
+                        continue
+                    size = round(s["size"], 1)
+                    bold = "bold" in s["font"].lower()
+                    y = s["bbox"][1]
+                    style = (size, bold)
+                    styles.append(style)
+
+                    if page_num == 0:
+                        first_page_blocks.append(Span(text, size, s["font"], bold, page_num + 1, y))
+                    if is_heading_candidate(text, size, s["font"], bold, y):
+                        cand_texts.append(text)
+                        cand_styles.append(style)
+                        cand_pages.append(page_num)
+
+        # Fold each page's styles into the counter (bulk update runs in
+        # Counter's C helper) so only one page of spans is held at a time
+        style_counter.update(styles)
+
+    return style_counter, first_page_blocks, cand_texts, cand_styles, cand_pages
+
+
+def scan_page_range(pdf_path, start, end):
+    # Worker entry point for page-parallel parsing
+    with fitz.open(pdf_path) as doc:
+        return scan_pages(doc, start, end)
 
 
-def extract_outline(pdf_path):
+def extract_outline(pdf_path, max_pages=None, page_workers=1):
     try:
         doc = fitz.open(pdf_path)
     except Exception as e:
         return {"title": f"Error opening file: {e}", "outline": []}
 
-    text_blocks = []
-    for page_num, page in enumerate(doc):
-        blocks = page.get_text("dict")["blocks"]
-        for b in blocks:
-            if "lines" not in b:
-                continue
-            for l in b["lines"]:
-                for s in l["spans"]:
-                    text = normalize(s["text"])
-                    if not text:
-                        continue
-                    text_blocks.append({
-                        "text": text,
-                        "size": round(s["size"], 1),
-                        "font": s["font"],
-                        "bold": "bold" in s["font"].lower(),
-                        "page": page_num + 1,
-                        "y": s["bbox"][1]
-                    })
-
-    if not text_blocks:
+    # max_pages bounds the work on very long PDFs; the document is closed
+    # as soon as the walk is done
+    with doc:
+        page_count = doc.page_count if max_pages is None else min(doc.page_count, max_pages)
+        if page_workers > 1 and page_count >= PARALLEL_MIN_PAGES:
+            # Long PDF: split the pages into contiguous ranges. The first range
+            # is scanned here on the already-open document while the other
+            # ranges run in worker processes
+            bounds = [page_count * i // page_workers for i in range(page_workers + 1)]
+            with ProcessPoolExecutor(max_workers=page_workers - 1) as ex:
+                rest = ex.map(scan_page_range, repeat(pdf_path), bounds[1:-1], bounds[2:])
+                parts = [scan_pages(doc, bounds[0], bounds[1])]
+                parts.extend(rest)
+        else:
+            parts = [scan_pages(doc, 0, page_count)]
+
+    # Ranges come back in page order, so concatenating keeps document order
+    style_counter = collections.Counter()
+    first_page_blocks = parts[0][1]
+    cand_texts, cand_styles, cand_pages = [], [], []
+    for counts, _, texts, styles, pages in parts:
+        style_counter.update(counts)
+        cand_texts += texts
+        cand_styles += styles
+        cand_pages += pages
+
+    if not style_counter:
         return {"title": "No text found", "outline": []}
 
-    first_page_blocks = [b for b in text_blocks if b["page"] == 1]
     title = extract_title(first_page_blocks)
 
-    style_to_level = group_styles(text_blocks)
+    style_to_level = group_styles(style_counter)
 
     outline = []
     seen = set()
-    for b in text_blocks:
-        style = (b["size"], b["bold"])
-        if style not in style_to_level:
-            continue
-        if not is_heading_candidate(b["text"], b["size"], b["font"], b["bold"], b["y"]):
+    for text, style, page in zip(cand_texts, cand_styles, cand_pages):
+        level = style_to_level.get(style)
+        if level is None:
             continue
-        text = normalize(b["text"])
         if text in seen:
             continue
         seen.add(text)
         outline.append({
-            "level": style_to_level[style],
+            "level": level,
             "text": text,
-            "page": b["page"] - 1  # match schema
+            "page": page  # 0-based to match schema
         })
 
     return {
@@ -1,55 +1,17 @@
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+import heapq
+from functools import lru_cache
 
-def rank_sections(outlines, persona, job):
-    sections = []
-
-    # Flatten all outlines into (document, page, section_title, dummy_content)
-    for doc, content in outlines.items():
-        for item in content.get("outline", []):
-            page = item.get("page", 0)
-            text = item.get("text", "")
-            sections.append((doc, page, text, text))  # using text as dummy content
-
-    # print("DEBUG: Sections format =", sections)
-
-    if not sections:
-        print("No sections found.")
-        return []
-
-    # Construct query from persona and job
-    query = f"{persona} {job}"
-
-    # Corpus: section content + query
-    corpus = [s[3] for s in sections] + [query]
-
-    # Vectorize using TF-IDF
-    vectorizer = TfidfVectorizer().fit(corpus)
-    vectors = vectorizer.transform(corpus)
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
 
-    query_vec = vectors[-1]          # Last vector is the query
-    section_vecs = vectors[:-1]      # All others are section vectors
-
-    # Compute cosine similarity
-    scores = cosine_similarity(query_vec, section_vecs).flatten()
-
-    # Rank sections by score
-    ranked = sorted(zip(sections, scores), key=lambda x: x[1], reverse=True)
-
-    top_k = 5  # Change this if needed
-    top_sections = []
-    for rank, ((doc, page, title, _), score) in enumerate(ranked[:top_k], 1):
-        top_sections.append({
-            "document": doc,
-            "page_number": page,
-            "section_title": title,
-            "importance_rank": rank
-        })
-
-    return top_sections
+# Stateless single-pass term counter: no vocabulary dict to build per call
+_HASHER = HashingVectorizer(n_features=1 << 18, alternate_sign=False, norm=None, dtype=np.float32)
 
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+@lru_cache(maxsize=32)
+def query_counts(persona, job):
+    # Hashed counts depend only on the query text, so repeat calls reuse them
+    return _HASHER.transform([f"{persona} {job}"])
 
 def rank_sections(outlines, persona, job):
     sections = []
@@ -59,7 +21,7 @@ def rank_sections(outlines, persona, job):
         for item in content.get("outline", []):
             page = item.get("page", 0)
             text = item.get("text", "")
-            sections.append((doc, page, text, text)) # using text as dummy content
+            sections.append((doc, page, text, text))  # using text as dummy content
 
     # print("DEBUG: Sections format =", sections)
 
@@ -67,28 +29,38 @@ def rank_sections(outlines, persona, job):
         print("No sections found.")
         return []
 
-    # Construct query from persona and job
-    query = f"{persona} {job}"
-
-    # Corpus: section content + query
-    corpus = [s[3] for s in sections] + [query]
+    # Corpus: distinct section contents + query built from persona and job.
+    # Boilerplate titles repeat across PDFs, so each distinct text is hashed
+    # once and `inverse` maps every section back to its row.
+    row_of = {}
+    inverse = [row_of.setdefault(s[3], len(row_of)) for s in sections]
+    counts = sp.vstack([_HASHER.transform(list(row_of)), query_counts(persona, job)], format="csr")
 
-    # Vectorize using TF-IDF
-    vectorizer = TfidfVectorizer().fit(corpus)
-    vectors = vectorizer.transform(corpus)
+    # IDF still has to count every section, so fit it on the expanded rows
+    tfidf = TfidfTransformer().fit(counts[inverse + [len(row_of)]])
+    vectors = tfidf.transform(counts)
 
-    query_vec = vectors[-1] # Last vector is the query
-    section_vecs = vectors[:-1] # All others are section vectors
+    query_vec = vectors[-1]          # Last vector is the query
+    section_vecs = vectors[:-1]      # All others are distinct section vectors
 
-    # Compute cosine similarity
-    scores = cosine_similarity(query_vec, section_vecs).flatten()
+    # Rows are already L2-normalized, so cosine similarity is a single sparse
+    # matmul. The product stays sparse: only rows sharing a term with the
+    # query have a nonzero score, and only those are ranked.
+    sims = (section_vecs @ query_vec.T).tocoo()
+    row_scores = {r: v for r, v in zip(sims.row.tolist(), sims.data.tolist()) if v > 0}
+    hits = [i for i, r in enumerate(inverse) if r in row_scores]
 
-    # Rank sections by score
-    ranked = sorted(zip(sections, scores), key=lambda x: x[1], reverse=True)
+    # Select the top-k sections without sorting the whole candidate list
+    top_k = 5  # Change this if needed
+    top_idx = heapq.nlargest(top_k, hits, key=lambda i: row_scores[inverse[i]])
+    if len(top_idx) < top_k:
+        # Too few matches: fill with zero-score sections in input order,
+        # exactly as a full stable sort would
+        top_idx += [i for i, r in enumerate(inverse) if r not in row_scores][:top_k - len(top_idx)]
 
-    top_k = 5 # Change this if needed
     top_sections = []
-    for rank, ((doc, page, title, _), score) in enumerate(ranked[:top_k], 1):
+    for rank, i in enumerate(top_idx, 1):
+        doc, page, title, _ = sections[i]
         top_sections.append({
             "document": doc,
             "page_number": page,
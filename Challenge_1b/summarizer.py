@@ -1,10 +1,11 @@
 # File: Challenge_1b/summarizer.py
 
+from collections import defaultdict
+
 import fitz  # PyMuPDF
 
-def extract_text_from_page(pdf_path, page_number):
+def extract_text_from_page(doc, pdf_path, page_number):
     try:
-        doc = fitz.open(pdf_path)
         page = doc[page_number - 1]
         return page.get_text().strip()
     except Exception as e:
@@ -12,10 +13,24 @@ def extract_text_from_page(pdf_path, page_number):
         return ""
 
 def extract_subsections(pdf_dir, sections):
+    # Group requested pages by document so each PDF is opened only once
+    by_doc = defaultdict(list)
+    for i, sec in enumerate(sections):
+        by_doc[sec["document"]].append(i)
+
+    texts = {}
+    for doc_name, indices in by_doc.items():
+        pdf_path = f"{pdf_dir}/{doc_name}"
+        try:
+            with fitz.open(pdf_path) as doc:
+                for i in indices:
+                    texts[i] = extract_text_from_page(doc, pdf_path, sections[i]["page_number"])
+        except Exception as e:
+            print(f"Error opening {pdf_path}: {e}")
+
     results = []
-    for sec in sections:
-        pdf_path = f"{pdf_dir}/{sec['document']}"
-        text = extract_text_from_page(pdf_path, sec["page_number"])
+    for i, sec in enumerate(sections):
+        text = texts.get(i, "")
         if text:
             results.append({
                 "document": sec["document"],